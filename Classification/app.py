@@ -1,10 +1,14 @@
 from pathlib import Path
+import io
 import sys
-import pandas as pd
 import streamlit as st
 
 from utils.exception import CustomException
-from model_prediction.prediction_pipeline import PredictionPipeline
+
+config_path = Path("model_prediction/prediction_config.yaml")
+
+# rows scored per call in batch mode
+BATCH_CHUNK_SIZE = 10_000
 
 st.title("Quick-check classification project")
 st.write("""
@@ -18,7 +22,7 @@ numerical_features = ['Duration of Credit (month)',
         'Length of current employment', 'Instalment per cent',
        'Guarantors', 'Duration in Current address',
        'Most valuable available asset', 'Age', 'Concurrent Credits',
-       'No of Credits at this Bank', 
+       'No of Credits at this Bank',
        'No of dependents']
 
 # nominal categorical feautes
@@ -26,35 +30,164 @@ categorical_features = {"Account type":[1, 2, 4, 3], "Purpose":[2,0,9,3,1,10,5,4
                 "Savings type":[1,2,3,5,4], "Type of apartment":[1,2,3],"Marital Status":[2,3,4,1],
                 "Occupation":[3,2,1,4],"Foreign Worker":[1,2]}
 
-entered_values = {}
-st.title('Numerical Inputs')
-
-# Loop through each numerical feature and create a numerical input bar
-for col_name in numerical_features:
-    value = st.number_input(col_name, value=0.0)
-    entered_values[col_name] = value
-
-# Loop through each categorical feature and create drop down menu
-for feature, options in categorical_features.items():
-    value = st.selectbox(feature, options= options)
-    entered_values[feature] = value
-
-
-if st.button("Make Prediction"):
-    try:
-        config_path = Path("model_prediction/prediction_config.yaml")
-        data_frame = pd.DataFrame(entered_values, index = [0])
-        prediction_obj = PredictionPipeline(input_data=data_frame,
-                                            config_path=config_path)
-        prediction_config = prediction_obj.get_prediction_config()
-        prediction = prediction_obj.make_prediction(prediction_config)
-
-        st.header("Label Prediction")
-        if prediction == 1:
-            prediction = "BAD (1)"
-        if prediction == 0:
-            prediction = "Good (0)"
-            
-        st.write(prediction)
-    except Exception as e:
-        raise CustomException(e,sys)
\ No newline at end of file
+
+@st.cache_resource
+def load_prediction_resources():
+    """
+    Builds the prediction pipeline and loads its config and model artifacts once
+    per server process, so widget reruns don't reload the pickles.
+    """
+    # imported on first use so the page renders before pandas and the
+    # model libraries are loaded
+    from model_prediction.prediction_pipeline import PredictionPipeline
+
+    prediction_obj = PredictionPipeline(input_data=None, config_path=config_path)
+    prediction_config = prediction_obj.get_prediction_config()
+    artifacts = prediction_obj.load_artifacts(prediction_config)
+    return prediction_config, artifacts
+
+
+@st.cache_data
+def read_uploaded_file(content: bytes, file_name: str):
+    """
+    Parses an uploaded CSV or Parquet file; cached on the file content so a
+    rerun doesn't parse it again.
+    """
+    import pandas as pd
+
+    if file_name.lower().endswith(".parquet"):
+        return pd.read_parquet(io.BytesIO(content))
+    return pd.read_csv(io.BytesIO(content))
+
+
+def validate_batch(data):
+    """
+    Checks an uploaded file against the expected schema: every feature column
+    present, numerical features numeric and non-missing, nominal features
+    within their known categories.
+
+    Returns:
+        list: Error messages, empty when the file is valid.
+    """
+    import pandas as pd
+
+    errors = []
+    missing = [column for column in numerical_features + list(categorical_features)
+               if column not in data.columns]
+    if missing:
+        return [f"Missing columns: {', '.join(missing)}"]
+
+    for column in numerical_features:
+        invalid = pd.to_numeric(data[column], errors="coerce").isna()
+        if invalid.any():
+            rows = (invalid[invalid].index[:5] + 1).tolist()
+            errors.append(f"'{column}' has {invalid.sum()} missing or non-numeric value(s), "
+                          f"e.g. rows {rows}")
+    for column, options in categorical_features.items():
+        invalid = ~data[column].isin(options)
+        if invalid.any():
+            values = data.loc[invalid, column].unique()[:5].tolist()
+            errors.append(f"'{column}' has {invalid.sum()} value(s) outside {sorted(options)}, "
+                          f"e.g. {values}")
+    return errors
+
+
+def score_batch(data):
+    """
+    Scores a validated DataFrame in chunks of BATCH_CHUNK_SIZE rows with a
+    progress bar, and returns it with a `prediction` column added, along with
+    the result encoded as CSV for the download button.
+    """
+    import numpy as np
+    import pandas as pd
+    from model_prediction.prediction_pipeline import PredictionPipeline
+
+    prediction_config, artifacts = load_prediction_resources()
+    features = data[numerical_features + list(categorical_features)].astype(
+        {column: "int64" for column in categorical_features})
+    features[numerical_features] = features[numerical_features].apply(pd.to_numeric)
+
+    predictions = np.empty(len(features), dtype=np.int64)
+    # one pipeline for the whole file, each chunk is swapped in as its input data
+    prediction_obj = PredictionPipeline(input_data=None, config_path=config_path)
+    progress = st.progress(0.0, text="Scoring...")
+    for start in range(0, len(features), BATCH_CHUNK_SIZE):
+        stop = min(start + BATCH_CHUNK_SIZE, len(features))
+        prediction_obj.data = features.iloc[start:stop]
+        predictions[start:stop] = prediction_obj.make_prediction(prediction_config, artifacts)
+        progress.progress(stop / len(features), text=f"Scored {stop:,} of {len(features):,} rows")
+    progress.empty()
+    result = data.assign(prediction=predictions)
+    return result, result.to_csv(index=False).encode("utf-8")
+
+
+mode = st.radio("Scoring mode", ["Single applicant", "Batch upload"], horizontal=True)
+
+if mode == "Single applicant":
+    entered_values = {}
+    st.title('Numerical Inputs')
+
+    # Loop through each numerical feature and create a numerical input bar
+    for col_name in numerical_features:
+        value = st.number_input(col_name, value=0.0)
+        entered_values[col_name] = value
+
+    # Loop through each categorical feature and create drop down menu
+    for feature, options in categorical_features.items():
+        value = st.selectbox(feature, options= options)
+        entered_values[feature] = value
+
+
+    if st.button("Make Prediction"):
+        try:
+            import pandas as pd
+            from model_prediction.prediction_pipeline import PredictionPipeline
+
+            prediction_config, artifacts = load_prediction_resources()
+            data_frame = pd.DataFrame(entered_values, index = [0])
+            prediction_obj = PredictionPipeline(input_data=data_frame,
+                                                config_path=config_path)
+            prediction = prediction_obj.make_prediction(prediction_config, artifacts)
+
+            st.header("Label Prediction")
+            if prediction == 1:
+                prediction = "BAD (1)"
+            if prediction == 0:
+                prediction = "Good (0)"
+
+            st.write(prediction)
+        except Exception as e:
+            raise CustomException(e,sys)
+
+else:
+    st.title('Batch Upload')
+    st.write("Upload a CSV or Parquet file with one applicant per row and a column "
+             "for each input feature. Other columns (e.g. an id) are kept in the output.")
+    uploaded_file = st.file_uploader("Applicants file", type=["csv", "parquet"])
+
+    if uploaded_file is not None:
+        try:
+            data = read_uploaded_file(uploaded_file.getvalue(), uploaded_file.name)
+            errors = validate_batch(data)
+            if errors:
+                for error in errors:
+                    st.error(error)
+            else:
+                st.write(f"{len(data):,} rows ready to score")
+                # results (and their CSV encoding) survive the reruns, such as the
+                # one triggered by the download button, without being recomputed
+                if st.button("Score File"):
+                    st.session_state["batch_result"] = (uploaded_file.file_id, *score_batch(data))
+
+                result_file_id, result, result_csv = st.session_state.get("batch_result",
+                                                                          (None, None, None))
+                if result_file_id == uploaded_file.file_id:
+                    st.header("Label Predictions")
+                    st.write(result["prediction"].value_counts().rename(
+                        index={1: "BAD (1)", 0: "Good (0)"}))
+                    st.dataframe(result.head(100))
+                    st.download_button("Download predictions",
+                                       data=result_csv,
+                                       file_name="predictions.csv", mime="text/csv")
+        except Exception as e:
+            raise CustomException(e,sys)
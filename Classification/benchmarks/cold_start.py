@@ -0,0 +1,111 @@
+"""
+Cold-start benchmark for the scoring path.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+It records how long it takes to import the prediction pipeline, load the
+artifacts and score one row. It also checks that heavy libraries the linear model
+does not need (sklearn, scipy, xgboost) stay unloaded while scoring. Drift
+monitoring is turned off for these runs, so the timing covers scoring only and
+no snapshot files are written. The script
+exits with a non-zero status when the median time exceeds the budget or an
+unexpected module is imported, so it can be used as a regression gate.
+
+Run from the Classification folder:
+
+    python benchmarks/cold_start.py --budget 1.0 --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# modules that must never be pulled in just to score with the linear model
+SCORING_FORBIDDEN = ["sklearn", "scipy", "xgboost", "streamlit"]
+# modules model_training must not load before a classifier is chosen
+TRAINER_FORBIDDEN = ["xgboost", "sklearn.ensemble", "sklearn.tree"]
+
+SCORE_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from pathlib import Path
+import pandas as pd
+from model_prediction.prediction_pipeline import PredictionPipeline
+imported = time.perf_counter()
+
+row = pd.read_csv("artifacts/Clean_data.csv", nrows=1).drop(columns=["label"])
+pipeline = PredictionPipeline(input_data=row,
+                              config_path=Path("model_prediction/prediction_config.yaml"))
+config = pipeline.get_prediction_config()
+# no monitor thread or snapshot file for a benchmark run
+config.monitoring.enabled = False
+pipeline.make_prediction(config)
+scored = time.perf_counter()
+
+print(json.dumps({"import": imported - start, "ready": scored - start,
+                  "modules": sorted(sys.modules)}))
+"""
+
+TRAINER_SNIPPET = """
+import json, sys
+import model_trainer.Components.model_training
+print(json.dumps({"modules": sorted(sys.modules)}))
+"""
+
+
+def run_snippet(snippet: str) -> dict:
+    """
+    Runs a snippet in a new interpreter from the project root and returns its
+    JSON output, with the total process wall time added under "wall".
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+    output["wall"] = wall
+    return output
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="maximum median seconds from process start to first score")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of cold starts to measure")
+    args = parser.parse_args()
+
+    failures = []
+
+    runs = [run_snippet(SCORE_SNIPPET) for _ in range(args.repeat)]
+    import_time = statistics.median(run["import"] for run in runs)
+    ready_time = statistics.median(run["ready"] for run in runs)
+    wall_time = statistics.median(run["wall"] for run in runs)
+    print(f"import prediction pipeline : {import_time:.3f}s")
+    print(f"ready to score (in process): {ready_time:.3f}s")
+    print(f"ready to score (wall)      : {wall_time:.3f}s  budget {args.budget:.3f}s")
+    if wall_time > args.budget:
+        failures.append(f"cold start {wall_time:.3f}s exceeds budget {args.budget:.3f}s")
+
+    scoring_modules = set(runs[0]["modules"])
+    trainer_modules = set(run_snippet(TRAINER_SNIPPET)["modules"])
+    for module in SCORING_FORBIDDEN:
+        if module in scoring_modules:
+            failures.append(f"{module} imported on the scoring path")
+    for module in TRAINER_FORBIDDEN:
+        if module in trainer_modules:
+            failures.append(f"{module} imported by model_training before a classifier is chosen")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
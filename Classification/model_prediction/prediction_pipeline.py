@@ -1,11 +1,15 @@
+import os
 from pathlib import Path
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from utils.exception import CustomException
+from utils.feature_store import FeatureStore
 from utils.helper import read_yaml, load_pickle
+from utils.monitoring import get_monitor
 
 
 
@@ -45,7 +49,42 @@ class PredictionPipeline:
             raise CustomException(e,sys)
     
 
-    def make_prediction(self, config: Dict[str, Any])-> int:
+    def load_artifacts(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Loads the model artifacts named in the configuration: the numpy-only scorer
+        when `scorer_artifact_dir` exists, otherwise the transformer and model
+        pickles, plus the memory-mapped feature store when it has been built.
+        Callers scoring many batches can load them once and pass them to
+        `make_prediction` / `make_prediction_by_id`; reload them after the
+        feature store is rebuilt.
+
+        Args:
+            config (Dict[str, Any]): The prediction configuration.
+
+        Returns:
+            Dict[str, Any]: Either {"scorer": ...} or {"transformer": ..., "model": ...},
+                            with "feature_store" added when the store exists.
+        """
+        try:
+            scorer_path = config.get("scorer_artifact_dir")
+            if scorer_path and os.path.exists(scorer_path):
+                artifacts = {"scorer": load_pickle(scorer_path)}
+            else:
+                artifacts = {"transformer": load_pickle(config.transformer_pickle_dir),
+                             "model": load_pickle(config.model_artifact_dir)}
+
+            store_dir = config.get("feature_store_dir")
+            if store_dir:
+                store = FeatureStore(store_dir)
+                if store.exists():
+                    artifacts["feature_store"] = store.open()
+            return artifacts
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def make_prediction(self, config: Dict[str, Any],
+                        artifacts: Optional[Dict[str, Any]] = None)-> int:
         """
         Executes the prediction process on the loaded data using specified configuration
         details for the transformer and model paths, as well as handling of nominal columns.
@@ -59,6 +98,15 @@ class PredictionPipeline:
                                     pre-trained machine learning model.
                                     - nominal_columns: A list of column names in the data
                                     that should be treated as categorical (nominal).
+                                    - float_dtype (optional): Float dtype of the features
+                                    passed to the model, float64 by default.
+                                    - scorer_artifact_dir (optional): Path to the numpy-only
+                                    LinearScorer pickle. When it exists it is used instead
+                                    of the two sklearn pickles, so sklearn is never imported.
+                                    - monitoring (optional): drift monitor settings. Scored
+                                    batches are handed to the worker's DriftMonitor.
+            artifacts (Dict[str, Any], optional): Artifacts from `load_artifacts`. They
+                                    are loaded from disk when not given.
 
         Returns:
             int: The predicted result generated by the machine learning model. Assumes
@@ -67,23 +115,77 @@ class PredictionPipeline:
 
         try:
             # extract all config
-            transformer_path = config.transformer_pickle_dir
-            model_path = config.model_artifact_dir
             nominal_columns = config.nominal_columns
+            float_dtype = config.get("float_dtype", "float64")
+
+            monitor = get_monitor(config.get("monitoring"))
+
+            # load transformer and model pickle file (or the linear scorer)
+            if artifacts is None:
+                artifacts = self.load_artifacts(config)
+
+            # fast path for the linear model: no sklearn import needed
+            if "scorer" in artifacts:
+                prediction = artifacts["scorer"].predict(self.data, dtype=float_dtype)
+                if monitor is not None:
+                    monitor.observe(self.data, prediction)
+                return prediction
 
-            # load transformer and model pickle file
-            transformer = load_pickle(transformer_path)
-            model = load_pickle(model_path)
+            transformer = artifacts["transformer"]
+            model = artifacts["model"]
 
-            # convert nominal feature to obj string
-            for feature in nominal_columns:
-                self.data[feature] = self.data[feature].astype(object)
+            # convert nominal feature to obj string and the rest to the float dtype
+            feature_types = {feature: (object if feature in nominal_columns else float_dtype)
+                             for feature in transformer.feature_names_in_}
+            self.data = self.data.astype(feature_types)
 
             # transform input data
-            transformed_data = transformer.transform(self.data)
+            transformed_data = transformer.transform(self.data).astype(float_dtype, copy=False)
             # make prediction
             prediction = model.predict(transformed_data)
+            if monitor is not None:
+                monitor.observe(self.data, prediction)
             return prediction
         
         except Exception as e:
-            raise CustomException(e,sys)
\ No newline at end of file
+            raise CustomException(e,sys)
+
+
+    def make_prediction_by_id(self, config: Dict[str, Any], user_ids: List[int],
+                              artifacts: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """
+        Scores known users straight from the feature store, skipping the
+        transformation step. Only the ids are needed, the input data is ignored.
+
+        Args:
+            config (Dict[str, Any]): The prediction configuration, which includes
+                                    `feature_store_dir` in addition to the model paths
+                                    used by `make_prediction`.
+            user_ids (List[int]): Ids of the users to score.
+            artifacts (Dict[str, Any], optional): Artifacts from `load_artifacts`, whose
+                                    open feature store is reused between calls.
+
+        Returns:
+            np.ndarray: One predicted label per requested id, in the same order.
+        """
+        try:
+            monitor = get_monitor(config.get("monitoring"))
+
+            if artifacts is None:
+                artifacts = self.load_artifacts(config)
+
+            # read only the requested rows from the memory-mapped store
+            store = artifacts.get("feature_store") or FeatureStore(config.feature_store_dir)
+            features = store.lookup(user_ids)
+
+            if "scorer" in artifacts:
+                prediction = artifacts["scorer"].predict_transformed(features)
+            else:
+                prediction = artifacts["model"].predict(features)
+            # the raw features are not stored, so only the predictions are monitored
+            if monitor is not None:
+                monitor.observe(None, prediction)
+            return prediction
+
+        except Exception as e:
+            raise CustomException(e,sys)
@@ -80,9 +80,44 @@ class DataCleaningComponent:
                 upper_bound = Q3 + 1.5 * IQR
                 
                 # Cap values above the upper bound at the upper bound
-                df[column_name] = df[column_name].apply(lambda x: min(x, upper_bound))
+                df[column_name] = df[column_name].clip(upper=upper_bound)
             logging.info(f"all outliers have been removed, size of data: {df.shape}")
             return df
         
         except Exception as e:
             raise CustomException(e,sys)
+
+
+    def apply_dtype_policy(self, data_cleaning_config: Dict[str, Any])->pd.DataFrame:
+        """
+        Applies the numeric precision policy: float columns are cast to
+        `float_dtype` and, if `downcast_integers` is set, integer columns are
+        downcast to the smallest integer type that holds their values (int8 for
+        the codes in this dataset).
+
+        Parameters:
+        ----------
+        data_cleaning_config : dict
+            A dictionary containing `float_dtype` and `downcast_integers`.
+
+        Returns:
+        -------
+        pd.DataFrame:
+            The DataFrame with the precision policy applied.
+        """
+        try:
+            float_dtype = data_cleaning_config.get("float_dtype", "float64")
+            downcast_integers = data_cleaning_config.get("downcast_integers", False)
+            logging.info(f"applying dtype policy: floats as {float_dtype}, "
+                         f"downcast integers: {downcast_integers}")
+            df = self.data
+            for column_name in df.columns:
+                if pd.api.types.is_float_dtype(df[column_name]):
+                    df[column_name] = df[column_name].astype(float_dtype, copy=False)
+                elif downcast_integers and pd.api.types.is_integer_dtype(df[column_name]):
+                    df[column_name] = pd.to_numeric(df[column_name], downcast="integer")
+            logging.info(f"memory usage after dtype policy: {df.memory_usage(deep=True).sum()} bytes")
+            return df
+
+        except Exception as e:
+            raise CustomException(e,sys)
@@ -1,14 +1,66 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from glob import glob
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, List, Optional
 
 from utils.helper import read_yaml
 from utils.exception import CustomException
 from utils.logger import logging
 
+import os
 import pandas as pd
 import sys
 
 
+def check_schema(shard: pd.DataFrame, path: str,
+                 expected_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Checks a shard (or a chunk of one) against the expected column set and
+    returns it with its columns in the expected order.
+
+    Raises:
+    ------
+    ValueError:
+        If columns are missing or unexpected columns are present.
+    """
+    if expected_columns is None:
+        return shard
+    missing = set(expected_columns) - set(shard.columns)
+    unexpected = set(shard.columns) - set(expected_columns)
+    if missing or unexpected:
+        raise ValueError(f"schema mismatch in {path}: missing columns {sorted(missing)}, "
+                         f"unexpected columns {sorted(unexpected)}")
+    if list(shard.columns) != list(expected_columns):
+        shard = shard[list(expected_columns)]
+    return shard
+
+
+def read_shard(path: str, expected_columns: Optional[List[str]] = None,
+               deduplicate_on: Optional[str] = None) -> pd.DataFrame:
+    """
+    Reads a single CSV shard, checks it against the expected column set and
+    optionally drops duplicate rows on a key column.
+
+    Defined at module level so it can be sent to a process pool.
+
+    Parameters:
+    ----------
+    path : str
+        Path of the CSV shard.
+    expected_columns : list, optional
+        Column names every shard must have.
+    deduplicate_on : str, optional
+        Column used to drop duplicate rows inside the shard (keeps the last row).
+
+    Returns:
+    -------
+    pd.DataFrame:
+        The shard, with columns in the order of expected_columns when given.
+    """
+    shard = check_schema(pd.read_csv(path), path, expected_columns)
+    if deduplicate_on is not None:
+        shard = shard.drop_duplicates(subset=deduplicate_on, keep="last")
+    return shard
 
 
 class DataIngestionComponent:
@@ -33,20 +85,65 @@ class DataIngestionComponent:
             config = self.config.data_ingestion
             logging.info("data ingestion config has been read")
             return config
-        
+
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def resolve_sources(self, config: Dict[str, str])->List[str]:
+        """
+        Expands `source_dir` into a sorted list of CSV files. `source_dir` may be a
+        single file, a directory (every *.csv inside it), a glob pattern or a list
+        of any of these.
+
+        Parameters:
+        ----------
+        config : dict
+            Data ingestion configuration, including the source directory.
+
+        Returns:
+        -------
+        list:
+            Paths of all CSV shards to read.
+        """
+        try:
+            sources = config.source_dir
+            if isinstance(sources, str):
+                sources = [sources]
+
+            files = []
+            for source in sources:
+                if os.path.isdir(source):
+                    files.extend(glob(os.path.join(source, "*.csv")))
+                elif os.path.isfile(source):
+                    files.append(source)
+                else:
+                    files.extend(glob(source))
+
+            # the same shard could be matched by more than one entry
+            files = sorted(set(files))
+            if not files:
+                raise FileNotFoundError(f"no csv file found for source_dir {config.source_dir}")
+            return files
+
         except Exception as e:
             raise CustomException(e,sys)
-    
+
 
     def ingest_data(self, config: Dict[str, str])->pd.DataFrame:
         """
-        Reads data from the source directory defined in the configuration 
+        Reads data from the source directory defined in the configuration
         and loads it into a pandas DataFrame.
 
+        When the source resolves to several shards they are read concurrently,
+        checked against the expected column set and concatenated once.
+
         Parameters:
         ----------
         config : dict
-            Data ingestion configuration, including the source directory.
+            Data ingestion configuration, including the source directory and the
+            optional keys `expected_columns`, `deduplicate_on`, `max_workers` and
+            `executor` ("thread" or "process").
 
         Returns:
         -------
@@ -54,13 +151,76 @@ class DataIngestionComponent:
             A DataFrame containing the ingested data.
         """
         try:
-            logging.info("reading data")
-            data = pd.read_csv(config.source_dir)
+            files = self.resolve_sources(config)
+            expected_columns = config.get("expected_columns")
+            if expected_columns is not None:
+                expected_columns = list(expected_columns)
+            deduplicate_on = config.get("deduplicate_on")
+
+            logging.info(f"reading data from {len(files)} file(s)")
+            if len(files) == 1:
+                data = read_shard(files[0], expected_columns, deduplicate_on)
+            else:
+                # without a configured schema every shard must match the first one
+                if expected_columns is None:
+                    expected_columns = pd.read_csv(files[0], nrows=0).columns.to_list()
+
+                max_workers = config.get("max_workers") or os.cpu_count()
+                executor_type = config.get("executor", "thread")
+                if executor_type == "process":
+                    executor = ProcessPoolExecutor(max_workers=max_workers)
+                elif executor_type == "thread":
+                    executor = ThreadPoolExecutor(max_workers=max_workers)
+                else:
+                    raise ValueError(f"unknown executor: {executor_type}")
+
+                with executor:
+                    shards = list(executor.map(read_shard, files,
+                                               [expected_columns] * len(files),
+                                               [deduplicate_on] * len(files)))
+                data = pd.concat(shards, ignore_index=True, copy=False)
+                del shards
+
+                # a key may appear in more than one shard, keep its latest row
+                if deduplicate_on is not None:
+                    data = data.drop_duplicates(subset=deduplicate_on, keep="last",
+                                                ignore_index=True)
+
             data_size = data.shape
             logging.info(f"data has been read successfully. size of data is {data_size}")
             return data
-        
+
         except Exception as e:
             raise CustomException(e,sys)
 
 
+    def iter_chunks(self, config: Dict[str, str], chunk_size: int)->Iterator[pd.DataFrame]:
+        """
+        Streams the source shards one chunk at a time, so data larger than memory
+        can be consumed. Chunks are schema-checked like in `ingest_data`;
+        `deduplicate_on` is not applied since it needs every key in memory.
+
+        Parameters:
+        ----------
+        config : dict
+            Data ingestion configuration, including the source directory.
+        chunk_size : int
+            Number of rows per chunk.
+
+        Returns:
+        -------
+        Iterator[pd.DataFrame]:
+            Chunks in shard order, the same order on every call.
+        """
+        try:
+            files = self.resolve_sources(config)
+            expected_columns = config.get("expected_columns")
+            if expected_columns is None:
+                expected_columns = pd.read_csv(files[0], nrows=0).columns.to_list()
+            expected_columns = list(expected_columns)
+        except Exception as e:
+            raise CustomException(e,sys)
+
+        for path in files:
+            for chunk in pd.read_csv(path, chunksize=chunk_size):
+                yield check_schema(chunk, path, expected_columns)
@@ -90,6 +90,7 @@ class DataTransformationComponent:
             # extract target feature and location to save transformer object from config
             target = data_transformation_config.target
             save_location = data_transformation_config.transformer_pickle
+            float_dtype = data_transformation_config.get("float_dtype", "float64")
 
 
             df = dataframe.drop([target], axis =1)
@@ -97,11 +98,15 @@ class DataTransformationComponent:
             logging.info("separating numerical and categorical data")
             numerical_features = df.select_dtypes(exclude = "object").columns.to_list()
             categorical_features = df.select_dtypes(include = "object").columns.to_list()
+
+            # scalers upcast integer input to float64, so numerical features are
+            # cast to the configured float dtype before fitting
+            df[numerical_features] = df[numerical_features].astype(float_dtype)
             
             # Transformers
             logging.info("instantiating tranformers")
             numerical_transformer = MinMaxScaler()
-            categorical_transformer = OneHotEncoder(drop = 'if_binary')
+            categorical_transformer = OneHotEncoder(drop = 'if_binary', dtype = float_dtype)
             
             # define column transformer object
             pipeline = ColumnTransformer(
@@ -112,7 +117,7 @@ class DataTransformationComponent:
             
             # apply transformer
             logging.info("fit and transformers")
-            transformed_array = pipeline.fit_transform(df)
+            transformed_array = pipeline.fit_transform(df).astype(float_dtype, copy=False)
             
             # Get the transformed column names
             transformed_numerical_columns = pipeline.transformers_[0][2]
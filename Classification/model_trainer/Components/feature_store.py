@@ -0,0 +1,100 @@
+from pathlib import Path
+import sys
+from typing import Any, Dict, Optional
+
+from model_trainer.Components.data_ingestion import DataIngestionComponent
+from utils.exception import CustomException
+from utils.feature_store import FeatureStore
+from utils.helper import read_yaml, load_pickle, file_fingerprint
+from utils.logger import logging
+
+
+class FeatureStoreComponent:
+    """
+    Builds the user_id-keyed feature store: raw rows are read with the ingestion
+    component, passed through the fitted transformer and upserted into a
+    memory-mapped FeatureStore, so known users can be scored by id.
+    """
+    def __init__(self, config_file: Path) -> None:
+        self.config_file = config_file
+        self.config = read_yaml(config_file)
+
+
+    def get_feature_store_config(self)->Dict[str, Any]:
+        """
+        Retrieves the feature store configuration from the YAML file.
+
+        Returns:
+        -------
+        dict:
+            A dictionary with the raw source, the key column and the store location.
+        """
+        try:
+            logging.info("getting feature store config")
+            feature_store_config = self.config.feature_store
+            logging.info("feature store config has been read")
+            return feature_store_config
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def build_feature_store(self, feature_store_config: Dict[str, Any],
+                            chunk_size: Optional[int] = None)->FeatureStore:
+        """
+        Transforms the raw rows of `source_dir` with the fitted transformer and
+        upserts them into the store, keyed on `key`. Rows of ids already in the
+        store are overwritten, new ids are added. If the transformer was refitted
+        or the float dtype changed since the store was built, it is rebuilt from
+        the source rows alone.
+
+        Parameters:
+        ----------
+        feature_store_config : dict
+            Feature store configuration: `source_dir` (any source accepted by the
+            ingestion component), `key` and `store_dir`.
+        chunk_size : int, optional
+            When given, the source is streamed and upserted `chunk_size` rows at a
+            time (out-of-core mode), so memory does not grow with the source.
+            A key repeated across chunks keeps its last row.
+
+        Returns:
+        -------
+        FeatureStore:
+            The updated feature store.
+        """
+        try:
+            key = feature_store_config.key
+            transformation_config = self.config.data_transformation
+            ingestion_obj = DataIngestionComponent(self.config_file)
+
+            transformer = load_pickle(transformation_config.transformer_pickle)
+            fingerprint = file_fingerprint(transformation_config.transformer_pickle)
+            columns = transformer.get_feature_names_out().tolist()
+            # nominal columns as objects, the rest in the configured float dtype
+            float_dtype = transformation_config.get("float_dtype", "float64")
+            nominal_columns = transformation_config.nominal_columns
+            feature_types = {feature: (object if feature in nominal_columns else float_dtype)
+                             for feature in transformer.feature_names_in_}
+
+            store = FeatureStore(feature_store_config.store_dir)
+            def upsert(data):
+                features = data[list(transformer.feature_names_in_)].astype(feature_types)
+                transformed = transformer.transform(features).astype(float_dtype, copy=False)
+                store.upsert(user_ids=data[key].to_numpy(), features=transformed,
+                             columns=columns, transformer_fingerprint=fingerprint)
+
+            if chunk_size is None:
+                # read raw rows, keeping only the latest row of each key
+                ingestion_config = feature_store_config.copy()
+                ingestion_config.deduplicate_on = key
+                data = ingestion_obj.ingest_data(ingestion_config)
+                logging.info("transforming features for the feature store")
+                upsert(data)
+            else:
+                logging.info(f"transforming features for the feature store in chunks of {chunk_size} rows")
+                for chunk in ingestion_obj.iter_chunks(feature_store_config, chunk_size):
+                    upsert(chunk)
+            logging.info(f"feature store updated, it holds {len(store.user_ids)} users")
+            return store
+        except Exception as e:
+            raise CustomException(e,sys)
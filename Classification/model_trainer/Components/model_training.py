@@ -1,18 +1,49 @@
+import os
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import f1_score, precision_score, recall_score, accuracy_score
 from sklearn.model_selection import train_test_split
-from sklearn.tree import DecisionTreeClassifier
-from xgboost import XGBClassifier
 
-from utils.helper import read_yaml, save_to_pickle
+from utils.helper import read_yaml, save_to_pickle, load_pickle
 from utils.exception import CustomException
 from utils.logger import logging
 
+
+def get_classifier(classifier_name: str, param: Dict[str, Any]):
+    """
+    Instantiates the classifier named in the config file. Each estimator's
+    library is imported here, so only the configured classifier is loaded.
+
+    Parameters:
+    ----------
+    classifier_name : str
+        One of 'Logistics Regression', 'Decision tree', 'Random Forest' or 'XGBoost'.
+    param : dict
+        Keyword arguments passed to the classifier.
+
+    Returns:
+    -------
+    object:
+        An unfitted classifier.
+    """
+    if classifier_name == 'Logistics Regression':
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(**param)
+    if classifier_name == 'Decision tree':
+        from sklearn.tree import DecisionTreeClassifier
+        return DecisionTreeClassifier(**param)
+    if classifier_name == 'Random Forest':
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(**param)
+    if classifier_name == 'XGBoost':
+        from xgboost import XGBClassifier
+        return XGBClassifier(**param)
+    raise ValueError(f"unknown classifier: {classifier_name}")
+
+
 class ModelTrainingComponent:
     """
     A component responsible for training machine learning models using configuration settings
@@ -21,6 +52,7 @@ class ModelTrainingComponent:
     def __init__(self,data: pd.DataFrame, 
                  config_file: Dict[str, Any]) -> None:
         self.data = data
+        self.config_file = config_file
         self.config = read_yaml(config_file)
 
 
@@ -42,7 +74,8 @@ class ModelTrainingComponent:
             raise CustomException(e,sys)
 
 
-    def train_model(self, model_config :Dict[str, Any]):
+    def train_model(self, model_config :Dict[str, Any],
+                    precision_sample: Optional[pd.DataFrame] = None):
         """
         Trains the specified model based on the configuration, 
         evaluates it using train/test splits,
@@ -53,6 +86,8 @@ class ModelTrainingComponent:
         model_config : dict
             Configuration dictionary containing model parameters such as
             param_grid, test size, classifier type, etc.
+        precision_sample : pd.DataFrame, optional
+            Cleaned rows still in float64, used by `check_precision`.
 
         Returns:
         -------
@@ -82,70 +117,259 @@ class ModelTrainingComponent:
                                                                 stratify=y_data)
 
 
-            # Define all classifiers
-            classifiers = {
-                'Logistics Regression': LogisticRegression(**param),
-                'Decision tree': DecisionTreeClassifier(**param),
-                'Random Forest': RandomForestClassifier(**param),
-                'XGBoost': XGBClassifier(**param)
-            }
-
-            # FIT models
-            for classifier_name, classifier in classifiers.items():
-                # select only classifier specified on config_file
-                if classifier_name == algo_type:
-                    print(f"\nResults for {classifier_name}:\n")
-
-                    # Train the classifier
-                    clss = classifier
-                    logging.info("fitting model")
-                    clss.fit(X_train, y_train)
-
-                    # Make predictions on Train
-                    logging.info("making prediction on test partition")
-                    y_train_pred = clss.predict(X_train)
-
-                    # Make predictions on Test
-                    y_pred = clss.predict(X_test)
-
-                    # Train info: Calculate and print metrics
-                    Train_accuracy = accuracy_score(y_train, y_train_pred)
-                    Train_precision = precision_score(y_train, y_train_pred)
-                    Train_recall = recall_score(y_train, y_train_pred)
-                    Train_f1 = f1_score(y_train, y_train_pred)
-
-
-                    # Test info: Calculate and print metrics
-                    Test_accuracy = accuracy_score(y_test, y_pred)
-                    Test_precision = precision_score(y_test, y_pred)
-                    Test_recall = recall_score(y_test, y_pred)
-                    Test_f1 = f1_score(y_test, y_pred)
-
-                    # log train result
-                    logging.info(f"\n Results from Train:")
-                    logging.info(f"Accuracy: {Train_accuracy:.4f}")
-                    
-                    logging.info(f"Precision: {Train_precision:.4f}")
-                    logging.info(f"Recall: {Train_recall:.4f}")
-                    logging.info(f"F1 Score: {Train_f1:.4f}")
-
-                    # log test result
-                    logging.info(f"\n Results from Test:")
-                    logging.info(f"Accuracy: {Test_accuracy:.4f}")
-                    logging.info(f"Precision: {Test_precision:.4f}")
-                    logging.info(f"Recall: {Test_recall:.4f}")
-                    logging.info(f"F1 Score: {Test_f1:.4f}")
-
-                    # Train final model on both train and test data
-                    logging.info("Training final model on all both "
-                                "train and test partition")
-                    clss = classifier
-                    logging.info("fitting final model")
-                    final_model = clss.fit(X_data, y_data)
-
-                    # save final model as pickle file
-                    logging.info("save the model")
-                    save_to_pickle(obj_path=model_dir, obj=final_model)
-                    logging.info("model has been saved")
+            # instantiate only the classifier specified on config_file
+            classifier_name = algo_type
+            classifier = get_classifier(classifier_name, param)
+
+            print(f"\nResults for {classifier_name}:\n")
+
+            # Train the classifier
+            clss = classifier
+            logging.info("fitting model")
+            clss.fit(X_train, y_train)
+
+            # Make predictions on Train
+            logging.info("making prediction on test partition")
+            y_train_pred = clss.predict(X_train)
+
+            # Make predictions on Test
+            y_pred = clss.predict(X_test)
+
+            # Train info: Calculate and print metrics
+            Train_accuracy = accuracy_score(y_train, y_train_pred)
+            Train_precision = precision_score(y_train, y_train_pred)
+            Train_recall = recall_score(y_train, y_train_pred)
+            Train_f1 = f1_score(y_train, y_train_pred)
+
+
+            # Test info: Calculate and print metrics
+            Test_accuracy = accuracy_score(y_test, y_pred)
+            Test_precision = precision_score(y_test, y_pred)
+            Test_recall = recall_score(y_test, y_pred)
+            Test_f1 = f1_score(y_test, y_pred)
+
+            # log train result
+            logging.info(f"\n Results from Train:")
+            logging.info(f"Accuracy: {Train_accuracy:.4f}")
+            
+            logging.info(f"Precision: {Train_precision:.4f}")
+            logging.info(f"Recall: {Train_recall:.4f}")
+            logging.info(f"F1 Score: {Train_f1:.4f}")
+
+            # log test result
+            logging.info(f"\n Results from Test:")
+            logging.info(f"Accuracy: {Test_accuracy:.4f}")
+            logging.info(f"Precision: {Test_precision:.4f}")
+            logging.info(f"Recall: {Test_recall:.4f}")
+            logging.info(f"F1 Score: {Test_f1:.4f}")
+
+            # Train final model on both train and test data
+            logging.info("Training final model on all both "
+                        "train and test partition")
+            clss = classifier
+            logging.info("fitting final model")
+            final_model = clss.fit(X_data, y_data)
+            self.check_precision(final_model, precision_sample, model_config)
+
+            # save final model as pickle file
+            logging.info("save the model")
+            save_to_pickle(obj_path=model_dir, obj=final_model)
+            logging.info("model has been saved")
+
+            # export a numpy-only scorer for the linear model so prediction
+            # workers don't import sklearn, and drop a stale one otherwise
+            scorer_dir = model_config.get("scorer_artifact_dir")
+            if scorer_dir:
+                if classifier_name == 'Logistics Regression':
+                    from utils.linear_scorer import LinearScorer
+                    transformer = load_pickle(self.config.data_transformation.transformer_pickle)
+                    scorer = LinearScorer.from_sklearn(transformer, final_model)
+                    save_to_pickle(obj_path=scorer_dir, obj=scorer)
+                    logging.info("linear scorer has been saved")
+                elif os.path.exists(scorer_dir):
+                    os.remove(scorer_dir)
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def check_precision(self, model, sample: Optional[pd.DataFrame],
+                        model_config: Dict[str, Any]) -> float:
+        """
+        Scores the same training rows twice, through a float64 transform path and
+        through the `float_dtype` path used in production, and checks that the
+        predicted probabilities differ by no more than `precision_tolerance`.
+
+        For the logistic regression model the two paths are the LinearScorer
+        decision scores with dtype float64 and `float_dtype`; for the other models
+        the rows go through the fitted transformer in each dtype and into
+        `predict_proba`. Skipped when `float_dtype` is float64, no tolerance is set
+        or no sample is given.
+
+        Parameters:
+        ----------
+        model : object
+            The fitted model.
+        sample : pd.DataFrame, optional
+            Cleaned training rows (with the target) taken before the dtype policy
+            was applied, so they still hold the float64 values.
+        model_config : dict
+            Configuration dictionary with `target`, `float_dtype` and
+            `precision_tolerance`.
+
+        Returns:
+        -------
+        float:
+            The largest absolute difference between the predicted probabilities
+            of the two paths (0.0 when skipped).
+
+        Raises:
+        ------
+        CustomException:
+            If the difference is above `precision_tolerance`.
+        """
+        try:
+            float_dtype = model_config.get("float_dtype", "float64")
+            tolerance = model_config.get("precision_tolerance")
+            if sample is None or tolerance is None or np.dtype(float_dtype) == np.float64:
+                return 0.0
+
+            logging.info(f"checking {float_dtype} against float64 predictions on "
+                         f"{len(sample)} training rows")
+            features = sample.drop(columns=[model_config.target])
+            transformation_config = self.config.data_transformation
+            transformer = load_pickle(transformation_config.transformer_pickle)
+
+            if getattr(model, "coef_", None) is not None:
+                from utils.linear_scorer import LinearScorer
+                scorer = LinearScorer.from_sklearn(transformer, model)
+                def probability(dtype):
+                    scores = scorer.decision_function_transformed(scorer.transform(features, dtype))
+                    return 1.0 / (1.0 + np.exp(-scores.astype(np.float64)))
+            else:
+                nominal_columns = transformation_config.nominal_columns
+                def probability(dtype):
+                    feature_types = {feature: (object if feature in nominal_columns else dtype)
+                                     for feature in transformer.feature_names_in_}
+                    transformed = transformer.transform(features.astype(feature_types))
+                    return model.predict_proba(transformed.astype(dtype, copy=False))[:, 1]
+
+            reference_probability = probability("float64")
+            reduced_probability = probability(float_dtype)
+
+            max_difference = float(np.max(np.abs(reduced_probability - reference_probability)))
+            flipped = float(np.mean((reduced_probability > 0.5) != (reference_probability > 0.5)))
+            logging.info(f"{float_dtype} vs float64: max probability difference "
+                         f"{max_difference:.2e}, labels changed {flipped:.2%}")
+            if max_difference > tolerance:
+                raise ValueError(f"{float_dtype} predictions differ from float64 by "
+                                 f"{max_difference:.2e}, above tolerance {tolerance}")
+            return max_difference
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def train_model_out_of_core(self, model_config: Dict[str, Any]):
+        """
+        Trains the XGBoost classifier without loading the dataset into memory.
+        Chunks from the ingestion sources go through the fitted transformer into
+        external-memory DMatrix objects (`hist` tree method); a held-out stream of
+        `test_size` rows is used for the metrics. The final model is then trained
+        on all rows and saved as a pickled XGBClassifier, like `train_model`.
+
+        Outlier capping is skipped since its quantiles need the full dataset;
+        tree splits are not affected by capping the upper tail. The transformer
+        must already be fitted (`data_transformation.transformer_pickle`).
+
+        Parameters:
+        ----------
+        model_config : dict
+            Configuration dictionary with the usual model settings and an
+            `out_of_core` section: `chunk_size`, `cache_dir` and `num_boost_round`.
+
+        Returns:
+        -------
+        None
+        """
+        try:
+            if model_config.classifier != 'XGBoost':
+                raise ValueError("out-of-core training is only available for 'XGBoost'")
+
+            import shutil
+            import xgboost
+            from model_trainer.Components.data_ingestion import DataIngestionComponent
+            from model_trainer.Components.out_of_core import (ChunkIterator, external_memory_dmatrix,
+                                                              to_classifier)
+
+            out_of_core_config = model_config.out_of_core
+            target = model_config.target
+            float_dtype = model_config.get("float_dtype", "float64")
+            cache_dir = out_of_core_config.cache_dir
+            model_dir = model_config.model_artifact_dir
+
+            # xgboost.train takes the booster parameters; n_estimators becomes the number of rounds
+            params = dict(model_config.param_grid)
+            num_boost_round = params.pop("n_estimators", out_of_core_config.num_boost_round)
+            params.update({"objective": "binary:logistic", "tree_method": "hist"})
+
+            transformation_config = self.config.data_transformation
+            transformer = load_pickle(transformation_config.transformer_pickle)
+            nominal_columns = transformation_config.nominal_columns
+            feature_types = {feature: (object if feature in nominal_columns else float_dtype)
+                             for feature in transformer.feature_names_in_}
+
+            def prepare(chunk):
+                features = chunk[list(transformer.feature_names_in_)].astype(feature_types)
+                transformed = transformer.transform(features).astype(float_dtype, copy=False)
+                return transformed, chunk[target].to_numpy()
+
+            ingestion_obj = DataIngestionComponent(self.config_file)
+            ingestion_config = ingestion_obj.get_data_ingestion_config()
+            def chunk_factory():
+                return ingestion_obj.iter_chunks(ingestion_config, out_of_core_config.chunk_size)
+
+            def dmatrix(split):
+                iterator = ChunkIterator(chunk_factory=chunk_factory, prepare=prepare, split=split,
+                                         test_size=model_config.test_size,
+                                         random_state=model_config.random_state,
+                                         cache_prefix=os.path.join(cache_dir, split))
+                return external_memory_dmatrix(iterator)
+
+            os.makedirs(cache_dir, exist_ok=True)
+            print("\nResults for XGBoost (out-of-core):\n")
+            logging.info("building external memory train and eval matrices")
+            dtrain, deval = dmatrix("train"), dmatrix("eval")
+
+            logging.info("fitting model")
+            booster = xgboost.train(params, dtrain, num_boost_round=num_boost_round,
+                                    evals=[(dtrain, "train"), (deval, "test")], verbose_eval=False)
+
+            # log train and held-out results
+            for partition, data in (("Train", dtrain), ("Test", deval)):
+                y_true = data.get_label()
+                y_pred = (booster.predict(data) > 0.5).astype(int)
+                logging.info(f"\n Results from {partition}:")
+                logging.info(f"Accuracy: {accuracy_score(y_true, y_pred):.4f}")
+                logging.info(f"Precision: {precision_score(y_true, y_pred):.4f}")
+                logging.info(f"Recall: {recall_score(y_true, y_pred):.4f}")
+                logging.info(f"F1 Score: {f1_score(y_true, y_pred):.4f}")
+            # free the matrices so xgboost removes their cache pages
+            del dtrain, deval, data
+
+            # Train final model on all chunks
+            logging.info("Training final model on all chunks")
+            dall = dmatrix("all")
+            final_booster = xgboost.train(params, dall, num_boost_round=num_boost_round)
+            del dall
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+            # save final model as pickle file
+            logging.info("save the model")
+            save_to_pickle(obj_path=model_dir, obj=to_classifier(final_booster))
+            logging.info("model has been saved")
+
+            # the linear scorer does not apply to this model
+            scorer_dir = model_config.get("scorer_artifact_dir")
+            if scorer_dir and os.path.exists(scorer_dir):
+                os.remove(scorer_dir)
         except Exception as e:
-            raise CustomException(e,sys)
\ No newline at end of file
+            raise CustomException(e,sys)
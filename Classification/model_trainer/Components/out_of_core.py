@@ -0,0 +1,84 @@
+"""
+Out-of-core XGBoost training. Chunks from the ingestion component are passed
+through the fitted transformer and fed to external-memory DMatrix objects, so
+peak memory is bounded by the chunk size rather than the dataset size.
+
+This module imports xgboost at the top and is itself only imported when the
+out-of-core mode is used.
+"""
+
+from typing import Callable, Iterable, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+import xgboost
+
+
+class ChunkIterator(xgboost.DataIter):
+    """
+    Feeds transformed chunks to xgboost, one per `next` call.
+
+    Every row is assigned to the held-out evaluation stream or the training
+    stream by a random draw seeded with (random_state, chunk index). A chunk is
+    read in the same order on every pass, so the split is identical across
+    xgboost's passes and between the train and eval iterators.
+
+    Args:
+        chunk_factory (Callable): Returns a fresh iterator over raw chunks.
+        prepare (Callable): Turns a raw chunk into (features, labels).
+        split (str): "train", "eval" or "all".
+        test_size (float): Fraction of rows held out for evaluation.
+        random_state (int): Seed of the train/eval split.
+        cache_prefix (str): Path prefix of xgboost's external-memory cache.
+    """
+    def __init__(self, chunk_factory: Callable[[], Iterable[pd.DataFrame]],
+                 prepare: Callable[[pd.DataFrame], Tuple[np.ndarray, np.ndarray]],
+                 split: str, test_size: float, random_state: int,
+                 cache_prefix: str) -> None:
+        if split not in ("train", "eval", "all"):
+            raise ValueError(f"unknown split: {split}")
+        self._chunk_factory = chunk_factory
+        self._prepare = prepare
+        self._split = split
+        self._test_size = test_size
+        self._random_state = random_state
+        self._chunks: Iterator[pd.DataFrame] = iter(())
+        self._index = 0
+        super().__init__(cache_prefix=cache_prefix)
+        self.reset()
+
+    def reset(self) -> None:
+        self._chunks = iter(self._chunk_factory())
+        self._index = 0
+
+    def next(self, input_data: Callable) -> int:
+        for chunk in self._chunks:
+            index = self._index
+            self._index += 1
+            if self._split != "all":
+                rng = np.random.default_rng([self._random_state, index])
+                held_out = rng.random(len(chunk)) < self._test_size
+                chunk = chunk[held_out if self._split == "eval" else ~held_out]
+            if len(chunk) == 0:
+                continue
+            features, labels = self._prepare(chunk)
+            input_data(data=features, label=labels)
+            return 1
+        return 0
+
+
+def external_memory_dmatrix(iterator: ChunkIterator) -> xgboost.DMatrix:
+    """
+    Builds a DMatrix whose pages are cached on disk under the iterator's cache prefix.
+    """
+    return xgboost.DMatrix(iterator, missing=np.nan)
+
+
+def to_classifier(booster: xgboost.Booster) -> xgboost.XGBClassifier:
+    """
+    Wraps a trained booster in an XGBClassifier, so the saved model has the same
+    `predict` interface as the in-memory training path.
+    """
+    classifier = xgboost.XGBClassifier()
+    classifier.load_model(bytearray(booster.save_raw(raw_format="json")))
+    return classifier
@@ -0,0 +1,166 @@
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from model_trainer.Components.data_ingestion import DataIngestionComponent
+from utils.exception import CustomException
+from utils.helper import read_yaml, load_pickle
+from utils.logger import logging
+from utils.monitoring import (CountSketch, build_reference_profile, build_reference_profile_from_chunks,
+                              category_keys)
+
+
+class ReferenceProfileComponent:
+    """
+    Saves the reference profile of the training data (per-feature histograms,
+    category counts and the model's predicted label distribution) that the
+    drift monitor in the prediction pipeline compares production traffic against.
+    """
+    def __init__(self, data: Optional[pd.DataFrame], config_file: Path) -> None:
+        self.data = data
+        self.config_file = config_file
+        self.config = read_yaml(config_file)
+
+
+    def get_monitoring_config(self)->Dict[str, Any]:
+        """
+        Retrieves the monitoring configuration from the YAML file.
+
+        Returns:
+        -------
+        dict:
+            A dictionary with the profile location and the number of bins.
+        """
+        try:
+            logging.info("getting monitoring config")
+            monitoring_config = self.config.monitoring
+            logging.info("monitoring config has been read")
+            return monitoring_config
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def save_reference_profile(self, monitoring_config: Dict[str, Any])->Dict[str, Any]:
+        """
+        Builds the reference profile from the raw training data and writes it as JSON.
+
+        Parameters:
+        ----------
+        monitoring_config : dict
+            Configuration with `reference_profile` (output path) and `n_bins`.
+
+        Returns:
+        -------
+        dict:
+            The reference profile.
+        """
+        try:
+            transformation_config = self.config.data_transformation
+            logging.info("building reference profile")
+            profile = build_reference_profile(data=self.data,
+                                              nominal_columns=transformation_config.nominal_columns,
+                                              target=transformation_config.target,
+                                              n_bins=monitoring_config.n_bins)
+
+            self.write_profile(profile, monitoring_config)
+            return profile
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def save_reference_profile_from_chunks(self, monitoring_config: Dict[str, Any],
+                                           chunk_size: int)->Dict[str, Any]:
+        """
+        Builds the reference profile by streaming the ingestion sources in chunks,
+        for the out-of-core training mode, and writes it as JSON. Histogram bin
+        edges come from a sample drawn across all chunks.
+
+        Parameters:
+        ----------
+        monitoring_config : dict
+            Configuration with `reference_profile` (output path) and `n_bins`.
+        chunk_size : int
+            Number of rows per chunk.
+
+        Returns:
+        -------
+        dict:
+            The reference profile.
+        """
+        try:
+            transformation_config = self.config.data_transformation
+            ingestion_obj = DataIngestionComponent(self.config_file)
+            ingestion_config = ingestion_obj.get_data_ingestion_config()
+            logging.info("building reference profile from chunks")
+            profile = build_reference_profile_from_chunks(
+                chunk_factory=lambda: ingestion_obj.iter_chunks(ingestion_config, chunk_size),
+                nominal_columns=transformation_config.nominal_columns,
+                target=transformation_config.target,
+                n_bins=monitoring_config.n_bins)
+
+            self.write_profile(profile, monitoring_config)
+            return profile
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def save_prediction_reference(self, monitoring_config: Dict[str, Any])->Dict[str, Any]:
+        """
+        Replaces the prediction reference of the saved profile with the trained
+        model's predicted label distribution on the training rows, so the
+        monitor's prediction PSI compares like with like. The raw rows are
+        streamed from the ingestion sources `chunk_size` at a time and scored
+        like the prediction pipeline does: transformer, then model, in the
+        configured float dtype.
+
+        Parameters:
+        ----------
+        monitoring_config : dict
+            Configuration with `reference_profile` and `chunk_size`.
+
+        Returns:
+        -------
+        dict:
+            The updated reference profile.
+        """
+        try:
+            transformation_config = self.config.data_transformation
+            transformer = load_pickle(transformation_config.transformer_pickle)
+            model = load_pickle(self.config.model_training.model_artifact_dir)
+            float_dtype = transformation_config.get("float_dtype", "float64")
+            nominal_columns = transformation_config.nominal_columns
+            feature_types = {feature: (object if feature in nominal_columns else float_dtype)
+                             for feature in transformer.feature_names_in_}
+
+            logging.info("scoring training rows for the prediction reference")
+            ingestion_obj = DataIngestionComponent(self.config_file)
+            ingestion_config = ingestion_obj.get_data_ingestion_config()
+            counts: Dict[str, int] = {}
+            for chunk in ingestion_obj.iter_chunks(ingestion_config, monitoring_config.chunk_size):
+                features = chunk[list(transformer.feature_names_in_)].astype(feature_types)
+                predictions = model.predict(transformer.transform(features).astype(float_dtype, copy=False))
+                for key, count in category_keys(predictions).value_counts().items():
+                    counts[key] = counts.get(key, 0) + int(count)
+
+            with open(monitoring_config.reference_profile) as file:
+                profile = json.load(file)
+            profile["prediction"] = CountSketch.from_counts(counts).to_dict()
+            self.write_profile(profile, monitoring_config)
+            return profile
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def write_profile(self, profile: Dict[str, Any], monitoring_config: Dict[str, Any]) -> None:
+        """
+        Writes the profile to `monitoring_config.reference_profile`.
+        """
+        save_location = monitoring_config.reference_profile
+        os.makedirs(os.path.dirname(save_location), exist_ok=True)
+        with open(save_location, "w") as file:
+            json.dump(profile, file)
+        logging.info("reference profile saved")
@@ -2,10 +2,13 @@ from pathlib import Path
 import sys
 
 from utils.exception import CustomException
+from utils.helper import read_yaml
 from model_trainer.Components.data_ingestion import DataIngestionComponent
 from model_trainer.Components.data_cleaning import DataCleaningComponent 
 from model_trainer.Components.data_transformation import DataTransformationComponent   
 from model_trainer.Components.model_training import ModelTrainingComponent   
+from model_trainer.Components.feature_store import FeatureStoreComponent
+from model_trainer.Components.reference_profile import ReferenceProfileComponent
 
 
 class TrainModel():
@@ -16,26 +19,67 @@ class TrainModel():
     try:
         config_path = Path("model_trainer/training_config.yaml")
 
-        # data ingestion
-        injest_obj = DataIngestionComponent(config_path)
-        inject_config = injest_obj.get_data_ingestion_config()
-        data = injest_obj.ingest_data(inject_config)
+        out_of_core = read_yaml(config_path).model_training.get("out_of_core", {})
+
+        if out_of_core.get("enabled", False):
+            # streams chunks from the ingestion sources through the already fitted
+            # transformer, so the in-memory stages below are skipped
+            model_train_obj = ModelTrainingComponent(data=None, config_file=config_path)
+            training_config = model_train_obj.get_model_config()
+
+            # reference profile for drift monitoring, summed over the same chunks
+            profile_obj = ReferenceProfileComponent(data=None, config_file=config_path)
+            monitoring_config = profile_obj.get_monitoring_config()
+            profile_obj.save_reference_profile_from_chunks(monitoring_config,
+                                                           chunk_size=out_of_core.chunk_size)
+
+            model_train_obj.train_model_out_of_core(model_config=training_config)
+        else:
+            # data ingestion
+            injest_obj = DataIngestionComponent(config_path)
+            inject_config = injest_obj.get_data_ingestion_config()
+            data = injest_obj.ingest_data(inject_config)
+
+            # reference profile for drift monitoring, taken before outliers are capped
+            # so it matches what the prediction pipeline receives
+            profile_obj = ReferenceProfileComponent(data=data, config_file=config_path)
+            monitoring_config = profile_obj.get_monitoring_config()
+            profile_obj.save_reference_profile(monitoring_config)
         
-        # data cleaning
-        cleaning_obj = DataCleaningComponent(data=data, config_file=config_path)
-        outlier_config = cleaning_obj.get_cleaning_config()
-        clean_df = cleaning_obj.remove_outliers(outlier_config)
-
-        # data transformation
-        transform_obj = DataTransformationComponent(data=clean_df, config_file=config_path)
-        transform_config = transform_obj.get_transformation_config()
-        transformed_df = transform_obj.convert_data_type(transform_config)
-        transformed_df = transform_obj.transform_data(transformed_df,transform_config)
-
-        # model training
-        model_train_obj = ModelTrainingComponent(data=transformed_df,config_file=config_path)
-        training_config = model_train_obj.get_model_config()
-        model_train_obj.train_model(model_config=training_config)
+            # data cleaning
+            cleaning_obj = DataCleaningComponent(data=data, config_file=config_path)
+            outlier_config = cleaning_obj.get_cleaning_config()
+            clean_df = cleaning_obj.remove_outliers(outlier_config)
+            # rows kept in float64 to check the reduced-precision path after training
+            precision_rows = read_yaml(config_path).model_training.get("precision_check_rows")
+            precision_sample = None
+            if precision_rows:
+                precision_sample = clean_df.sample(n=min(precision_rows, len(clean_df)),
+                                                   random_state=0)
+            clean_df = cleaning_obj.apply_dtype_policy(outlier_config)
+
+            # data transformation
+            transform_obj = DataTransformationComponent(data=clean_df, config_file=config_path)
+            transform_config = transform_obj.get_transformation_config()
+            transformed_df = transform_obj.convert_data_type(transform_config)
+            transformed_df = transform_obj.transform_data(transformed_df,transform_config)
+
+            # model training
+            model_train_obj = ModelTrainingComponent(data=transformed_df,config_file=config_path)
+            training_config = model_train_obj.get_model_config()
+            model_train_obj.train_model(model_config=training_config,
+                                        precision_sample=precision_sample)
+
+        # prediction reference for drift monitoring: the trained model's label
+        # distribution on the training rows
+        profile_obj.save_prediction_reference(monitoring_config)
+
+        # feature store for score-by-id, built with the transformer fitted above
+        feature_store_obj = FeatureStoreComponent(config_file=config_path)
+        feature_store_config = feature_store_obj.get_feature_store_config()
+        # in out-of-core mode the source is streamed and upserted chunk by chunk
+        chunk_size = out_of_core.chunk_size if out_of_core.get("enabled", False) else None
+        feature_store_obj.build_feature_store(feature_store_config, chunk_size=chunk_size)
     except Exception as e:
         raise CustomException(e,sys)
 
@@ -0,0 +1,275 @@
+import json
+import os
+from pathlib import Path
+import shutil
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.exception import CustomException
+from utils.logger import logging
+
+
+class FeatureStore:
+    """
+    A store of already-transformed feature vectors keyed on an integer id
+    (user_id), backed by memory-mapped numpy files so lookups only read
+    the requested rows from disk.
+
+    Files kept in a version folder of `store_dir`:
+        user_ids.npy : sorted int64 ids
+        features.npy : 2D feature matrix, row i belongs to user_ids[i]
+        columns.json : names of the transformed feature columns
+        metadata.json : feature dtype and fingerprint of the transformer that
+                        produced the vectors
+
+    `store_dir/CURRENT` names the live version folder. Merging new ids writes a
+    new version and swaps `CURRENT` with a single atomic rename, so a reader (or
+    a crash) never pairs the ids of one version with the features of another.
+
+    Args:
+        store_dir (Path): Folder holding the store files.
+    """
+    ids_file = "user_ids.npy"
+    features_file = "features.npy"
+    columns_file = "columns.json"
+    metadata_file = "metadata.json"
+    current_file = "CURRENT"
+
+    # number of rows copied at a time when new ids are merged in
+    merge_chunk_size = 100_000
+
+    def __init__(self, store_dir: Path) -> None:
+        self.store_dir = Path(store_dir)
+        self.user_ids: Optional[np.ndarray] = None
+        self.features: Optional[np.ndarray] = None
+        self.columns: Optional[List[str]] = None
+        self.metadata: Optional[Dict[str, Any]] = None
+
+
+    def exists(self) -> bool:
+        """
+        Returns True when the store has a live version on disk.
+        """
+        return (self.store_dir / self.current_file).exists()
+
+
+    def version_dir(self) -> Path:
+        """
+        Returns the folder of the live version, as named in `CURRENT`.
+        """
+        return self.store_dir / (self.store_dir / self.current_file).read_text().strip()
+
+
+    def open(self) -> "FeatureStore":
+        """
+        Memory-maps the files of the live version read-only.
+
+        Returns:
+            FeatureStore: The store itself, so calls can be chained.
+
+        Raises:
+            CustomException: If the ids and the feature matrix have different lengths.
+        """
+        try:
+            # a merge may swap versions and delete the old folder between reading
+            # CURRENT and loading the files, in which case CURRENT is read again
+            for attempt in range(2):
+                try:
+                    version_dir = self.version_dir()
+                    user_ids = np.load(version_dir / self.ids_file, mmap_mode="r")
+                    features = np.load(version_dir / self.features_file, mmap_mode="r")
+                    with open(version_dir / self.columns_file) as file:
+                        columns = json.load(file)
+                    with open(version_dir / self.metadata_file) as file:
+                        metadata = json.load(file)
+                    break
+                except FileNotFoundError:
+                    if attempt:
+                        raise
+            if len(user_ids) != len(features):
+                raise ValueError(f"corrupt feature store {version_dir}: {len(user_ids)} ids "
+                                 f"for {len(features)} feature rows")
+            self.user_ids, self.features, self.columns = user_ids, features, columns
+            self.metadata = metadata
+            return self
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def lookup(self, user_ids) -> np.ndarray:
+        """
+        Returns the feature vectors of the given ids, in the order requested.
+
+        Args:
+            user_ids (array-like): Ids to look up.
+
+        Returns:
+            np.ndarray: One row of transformed features per requested id.
+
+        Raises:
+            CustomException: If any of the ids is not in the store.
+        """
+        try:
+            if self.user_ids is None:
+                self.open()
+            ids = np.asarray(user_ids, dtype=np.int64)
+            positions = self._find(ids)
+            missing = positions < 0
+            if missing.any():
+                raise KeyError(f"{missing.sum()} user_id(s) not in feature store, "
+                               f"e.g. {ids[missing][:10].tolist()}")
+            return np.asarray(self.features[positions])
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def upsert(self, user_ids, features: np.ndarray, columns: List[str],
+               transformer_fingerprint: Optional[str] = None) -> None:
+        """
+        Inserts new ids and overwrites the feature vectors of existing ones.
+        Existing rows are updated in place; the files are only rewritten when
+        new ids have to be merged into the sorted index.
+
+        When the transformer fingerprint or the feature dtype differs from the
+        stored one, the stored vectors are stale and the store is rebuilt from
+        the given rows alone, dropping users that are not among them.
+
+        Args:
+            user_ids (array-like): Ids of the rows in `features`. If an id is
+                                   repeated, its last row wins.
+            features (np.ndarray): 2D array of transformed features.
+            columns (List[str]): Names of the feature columns.
+            transformer_fingerprint (str, optional): Fingerprint of the transformer
+                                   that produced `features`.
+        """
+        try:
+            ids = np.asarray(user_ids, dtype=np.int64)
+            features = np.asarray(features)
+            if features.ndim != 2 or len(features) != len(ids):
+                raise ValueError("features must be a 2D array with one row per user_id")
+
+            # keep the last row of every id, sorted by id
+            reversed_unique, reversed_index = np.unique(ids[::-1], return_index=True)
+            keep = len(ids) - 1 - reversed_index
+            ids, features = reversed_unique, features[keep]
+
+            metadata = {"dtype": features.dtype.str, "transformer": transformer_fingerprint}
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            if not self.exists():
+                self._write(ids, features, list(columns), metadata)
+                return
+
+            self.open()
+            if metadata != self.metadata:
+                logging.info(f"feature store was built with {self.metadata}, now {metadata}: "
+                             "rebuilding it")
+                self._write(ids, features, list(columns), metadata)
+                return
+            if list(columns) != self.columns:
+                raise ValueError("feature columns do not match the existing feature store")
+
+            positions = self._find(ids)
+            found = positions >= 0
+
+            # overwrite rows of known ids in place
+            if found.any():
+                stored = np.load(self.version_dir() / self.features_file, mmap_mode="r+")
+                stored[positions[found]] = features[found]
+                stored.flush()
+                del stored
+
+            if not found.all():
+                self._merge(ids[~found], features[~found])
+            self.open()
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def _find(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Returns the row of each id in the store, or -1 where it is absent.
+        """
+        stored_ids = self.user_ids
+        if stored_ids is None or len(stored_ids) == 0:
+            return np.full(len(ids), -1, dtype=np.int64)
+        positions = np.searchsorted(stored_ids, ids)
+        clipped = np.minimum(positions, len(stored_ids) - 1)
+        return np.where(stored_ids[clipped] == ids, clipped, -1)
+
+
+    def _merge(self, new_ids: np.ndarray, new_features: np.ndarray) -> None:
+        """
+        Merges sorted new ids into a new version of the store, streaming the
+        existing rows into it in chunks so the whole matrix is never loaded
+        into memory.
+        """
+        old_ids = self.user_ids
+        old_features = self.features
+        total = len(old_ids) + len(new_ids)
+
+        # both id arrays are sorted, so each row's slot in the merged arrays is
+        # its own index plus the number of rows from the other array before it
+        old_slots = np.arange(len(old_ids)) + np.searchsorted(new_ids, old_ids)
+        new_slots = np.arange(len(new_ids)) + np.searchsorted(old_ids, new_ids)
+
+        version_dir = self._new_version_dir()
+        merged_ids = np.lib.format.open_memmap(version_dir / self.ids_file, mode="w+",
+                                               dtype=np.int64, shape=(total,))
+        merged_features = np.lib.format.open_memmap(version_dir / self.features_file, mode="w+",
+                                                    dtype=old_features.dtype,
+                                                    shape=(total, old_features.shape[1]))
+        for start in range(0, len(old_ids), self.merge_chunk_size):
+            stop = start + self.merge_chunk_size
+            merged_ids[old_slots[start:stop]] = old_ids[start:stop]
+            merged_features[old_slots[start:stop]] = old_features[start:stop]
+        merged_ids[new_slots] = new_ids
+        merged_features[new_slots] = new_features
+        merged_ids.flush()
+        merged_features.flush()
+        del merged_ids, merged_features
+        self._write_json(version_dir, self.columns, self.metadata)
+
+        self.user_ids = self.features = None
+        self._swap(version_dir)
+
+
+    def _write(self, ids: np.ndarray, features: np.ndarray, columns: List[str],
+               metadata: Dict[str, Any]) -> None:
+        """
+        Writes a new store version from sorted ids and their features.
+        """
+        version_dir = self._new_version_dir()
+        np.save(version_dir / self.features_file, features)
+        np.save(version_dir / self.ids_file, ids)
+        self._write_json(version_dir, columns, metadata)
+        self._swap(version_dir)
+        self.open()
+
+
+    def _write_json(self, version_dir: Path, columns: List[str], metadata: Dict[str, Any]) -> None:
+        with open(version_dir / self.columns_file, "w") as file:
+            json.dump(columns, file)
+        with open(version_dir / self.metadata_file, "w") as file:
+            json.dump(metadata, file)
+
+
+    def _new_version_dir(self) -> Path:
+        version_dir = self.store_dir / f"v{time.time_ns()}"
+        version_dir.mkdir(parents=True)
+        return version_dir
+
+
+    def _swap(self, version_dir: Path) -> None:
+        """
+        Points `CURRENT` at `version_dir` with an atomic rename and removes the
+        previous version. Readers that already mapped it keep their mapping.
+        """
+        previous = self.version_dir() if self.exists() else None
+        current_tmp = self.store_dir / f"{self.current_file}.tmp"
+        current_tmp.write_text(version_dir.name)
+        os.replace(current_tmp, self.store_dir / self.current_file)
+        if previous is not None and previous != version_dir:
+            shutil.rmtree(previous, ignore_errors=True)
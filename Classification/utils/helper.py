@@ -1,3 +1,4 @@
+import hashlib
 import os
 from pathlib import Path
 import pickle
@@ -78,4 +79,29 @@ def load_pickle(object_path:Path):
         with open(object_path, 'rb') as file:
             return pickle.load(file)
     except Exception as e:
-        raise CustomException(e,sys)
\ No newline at end of file
+        raise CustomException(e,sys)
+
+
+def file_fingerprint(path: Path) -> str:
+    """
+    Returns the SHA-256 hex digest of a file's content, e.g. to tell whether a
+    pickled transformer has been refitted.
+
+    Parameters:
+    ----------
+    path : Path
+        The file to fingerprint.
+
+    Returns:
+    -------
+    str:
+        The hex digest.
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    except Exception as e:
+        raise CustomException(e,sys)
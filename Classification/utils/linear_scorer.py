@@ -0,0 +1,161 @@
+import sys
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from utils.exception import CustomException
+
+
+class LinearScorer:
+    """
+    A numpy-only copy of the fitted transformer and logistic regression model.
+
+    Unpickling the sklearn objects imports sklearn (and scipy), which costs most
+    of a worker's cold start. This class holds the same fitted parameters as plain
+    arrays, so scoring with the linear model only needs numpy and pandas.
+
+    Attributes:
+        numerical_columns (List[str]): Columns scaled with the MinMaxScaler.
+        scale (np.ndarray), offset (np.ndarray): MinMaxScaler `scale_` and `min_`.
+        categorical_columns (List[str]): Columns one-hot encoded.
+        categories (List[np.ndarray]): OneHotEncoder categories per column.
+        dropped (List[int]): Index of the dropped category per column, -1 if none.
+        coef (np.ndarray), intercept (float): Logistic regression weights.
+        classes (np.ndarray): Class labels of the model.
+    """
+
+    def __init__(self, numerical_columns: List[str], scale: np.ndarray, offset: np.ndarray,
+                 categorical_columns: List[str], categories: List[np.ndarray],
+                 dropped: List[int], coef: np.ndarray, intercept: float,
+                 classes: np.ndarray) -> None:
+        self.numerical_columns = numerical_columns
+        self.scale = scale
+        self.offset = offset
+        self.categorical_columns = categorical_columns
+        self.categories = categories
+        self.dropped = dropped
+        self.coef = coef
+        self.intercept = intercept
+        self.classes = classes
+
+
+    @classmethod
+    def from_sklearn(cls, transformer, model) -> "LinearScorer":
+        """
+        Builds a scorer from the fitted ColumnTransformer (MinMaxScaler followed by
+        OneHotEncoder) and a fitted binary LogisticRegression.
+
+        Args:
+            transformer: The fitted ColumnTransformer saved by the transformation stage.
+            model: The fitted LogisticRegression saved by the training stage.
+
+        Returns:
+            LinearScorer: The equivalent numpy-only scorer.
+
+        Raises:
+            CustomException: If the transformer or model has a different layout.
+        """
+        try:
+            fitted = [step for step in transformer.transformers_ if step[0] != "remainder"]
+            if len(fitted) != 2 or getattr(model, "coef_", None) is None or len(model.classes_) != 2:
+                raise ValueError("only a scaler + one-hot transformer with a binary "
+                                 "linear model can be exported")
+            (_, scaler, numerical_columns), (_, encoder, categorical_columns) = fitted
+            if encoder.drop_idx_ is None:
+                dropped = [-1] * len(encoder.categories_)
+            else:
+                dropped = [-1 if idx is None else int(idx) for idx in encoder.drop_idx_]
+
+            return cls(numerical_columns=list(numerical_columns),
+                       scale=np.asarray(scaler.scale_),
+                       offset=np.asarray(scaler.min_),
+                       categorical_columns=list(categorical_columns),
+                       categories=[np.asarray(cats) for cats in encoder.categories_],
+                       dropped=dropped,
+                       coef=np.asarray(model.coef_).ravel(),
+                       intercept=float(np.asarray(model.intercept_).ravel()[0]),
+                       classes=np.asarray(model.classes_))
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+    def _parameters(self, dtype):
+        """
+        Returns (scale, offset, coef, intercept) in `dtype`, so float32 features are
+        not upcast by float64 weights. Each dtype is cast once and then reused.
+        """
+        dtype = np.dtype(dtype)
+        # not set on scorers pickled before the cache existed
+        cache = self.__dict__.setdefault("_cast_parameters", {})
+        if dtype not in cache:
+            cache[dtype] = (self.scale.astype(dtype), self.offset.astype(dtype),
+                            self.coef.astype(dtype), dtype.type(self.intercept))
+        return cache[dtype]
+
+
+    def __getstate__(self):
+        # the cast copies are rebuilt on first use, keep them out of the pickle
+        state = self.__dict__.copy()
+        state.pop("_cast_parameters", None)
+        return state
+
+
+    def transform(self, data, dtype="float64") -> np.ndarray:
+        """
+        Applies the scaling and one-hot encoding to a DataFrame of raw features.
+
+        Args:
+            data (pd.DataFrame): Raw features with at least the fitted columns.
+            dtype (str): Float dtype of the output matrix.
+
+        Returns:
+            np.ndarray: The transformed feature matrix, same layout as the
+                        ColumnTransformer output.
+
+        Raises:
+            ValueError: If a numerical value is missing or not finite, or a
+                        nominal value is not a known category.
+        """
+        scale, offset, _, _ = self._parameters(dtype)
+        numerical = data[self.numerical_columns].to_numpy(dtype=dtype)
+        # a NaN score would silently fall to the first class, sklearn raises instead
+        invalid = ~np.isfinite(numerical)
+        if invalid.any():
+            columns = [self.numerical_columns[i] for i in np.unique(np.nonzero(invalid)[1])]
+            raise ValueError(f"missing or non-finite values in columns {columns}")
+        blocks = [numerical * scale + offset]
+        for column, cats, dropped in zip(self.categorical_columns, self.categories, self.dropped):
+            codes = pd.Categorical(data[column], categories=cats).codes
+            if (codes < 0).any():
+                unknown = data[column][codes < 0].unique().tolist()
+                raise ValueError(f"unknown categories {unknown} in column {column}")
+            encoded = np.zeros((len(codes), len(cats)), dtype=dtype)
+            encoded[np.arange(len(codes)), codes] = 1.0
+            if dropped >= 0:
+                encoded = np.delete(encoded, dropped, axis=1)
+            blocks.append(encoded)
+        return np.hstack(blocks)
+
+
+    def decision_function_transformed(self, features: np.ndarray) -> np.ndarray:
+        """
+        Returns the linear decision score (log-odds of the positive class)
+        for already transformed features.
+        """
+        _, _, coef, intercept = self._parameters(features.dtype)
+        return features @ coef + intercept
+
+
+    def predict_transformed(self, features: np.ndarray) -> np.ndarray:
+        """
+        Returns class labels for already transformed features.
+        """
+        return self.classes[(self.decision_function_transformed(features) > 0).astype(int)]
+
+
+    def predict(self, data, dtype="float64") -> np.ndarray:
+        """
+        Returns class labels for a DataFrame of raw features, transformed in `dtype`.
+        """
+        return self.predict_transformed(self.transform(data, dtype))
@@ -1,7 +1,9 @@
 """
 This script sets up logging for an application. 
-It creates a unique log directory based on the current timestamp 
+It picks a unique log directory based on the current timestamp 
 and configures logging to write both to a log file and to the console.
+The log directory is only created when the first record is written,
+so importing this module does no filesystem work.
 """
 
 import logging
@@ -11,18 +13,28 @@ import sys
 
 logs_unique_dir = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
 logs_path = os.path.join(os.getcwd(), "logs", logs_unique_dir)
-os.makedirs(logs_path, exist_ok = True)
 
 log_file_path = os.path.join(logs_path, "Running_logs.log")
 
 
+class LazyFileHandler(logging.FileHandler):
+    """
+    A FileHandler that defers creating the log directory and opening
+    the log file until the first record is emitted.
+    """
+    def __init__(self, filename: str):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
 
 
 logging.basicConfig(
     format = "[%(asctime)s] %(lineno)d -%(levelname)s - %(message)s",
     level = logging.INFO,
     handlers=[
-        logging.FileHandler(log_file_path),
+        LazyFileHandler(log_file_path),
         logging.StreamHandler(sys.stdout)
     ]
-)
\ No newline at end of file
+)
@@ -0,0 +1,467 @@
+import atexit
+from collections import deque
+import glob
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.exception import CustomException
+from utils.logger import logging
+
+# probability floor so empty bins don't make PSI infinite
+PSI_EPSILON = 1e-4
+# rows sampled across all chunks to place the histogram bin edges
+EDGE_SAMPLE_SIZE = 100_000
+
+
+class HistogramSketch:
+    """
+    A mergeable, fixed-size quantile sketch for a numeric feature: counts per
+    bin, with bin edges taken from the training quantiles. Memory depends only
+    on the number of bins, two sketches with the same edges merge by adding
+    their counts, and the bins line up with the reference profile for PSI/KS.
+
+    Args:
+        edges (List[float]): Sorted inner bin edges; there are len(edges) + 1 bins.
+    """
+    def __init__(self, edges: List[float]) -> None:
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.missing = 0
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        nan = np.isnan(values)
+        self.missing += int(nan.sum())
+        bins = np.searchsorted(self.edges, values[~nan], side="right")
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+
+    def merge(self, other: "HistogramSketch") -> None:
+        self.counts += other.counts
+        self.missing += other.missing
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"edges": self.edges.tolist(), "counts": self.counts.tolist(),
+                "missing": self.missing}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HistogramSketch":
+        sketch = cls(data["edges"])
+        sketch.counts = np.asarray(data["counts"], dtype=np.int64)
+        sketch.missing = data.get("missing", 0)
+        return sketch
+
+
+def category_keys(values) -> pd.Series:
+    """
+    Converts category values to the string keys of a CountSketch. Integral
+    floats (codes read back as float from CSV or JSON) become "1" rather than
+    "1.0", so they match the reference categories.
+    """
+    series = pd.Series(values).infer_objects()
+    if pd.api.types.is_float_dtype(series):
+        finite = series.dropna()
+        if (finite == np.round(finite)).all():
+            series = series.astype("Int64")
+    return series.astype(str)
+
+
+class CountSketch:
+    """
+    A count table for a nominal feature or for the predicted labels. Values not
+    in the reference categories are counted under "other", so memory stays bounded.
+
+    Args:
+        categories (List[str]): Known categories, as strings.
+    """
+    other = "other"
+
+    def __init__(self, categories: List[str]) -> None:
+        self.categories = [str(category) for category in categories]
+        self.counts = dict.fromkeys(self.categories + [self.other], 0)
+
+    def update(self, values) -> None:
+        for value, count in category_keys(values).value_counts().items():
+            key = value if value in self.counts else self.other
+            self.counts[key] += int(count)
+
+    def merge(self, other: "CountSketch") -> None:
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"categories": self.categories, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CountSketch":
+        sketch = cls(data["categories"])
+        sketch.counts.update(data["counts"])
+        return sketch
+
+    @classmethod
+    def from_counts(cls, counts: Dict[str, int]) -> "CountSketch":
+        """
+        Builds a sketch whose categories are the keys of `counts`.
+        """
+        sketch = cls(sorted(counts))
+        sketch.counts.update(counts)
+        return sketch
+
+
+def _distribution(counts) -> np.ndarray:
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    return counts / total if total else counts
+
+
+def population_stability_index(reference_counts, current_counts) -> float:
+    """
+    PSI between two count vectors over the same bins.
+    """
+    expected = np.maximum(_distribution(reference_counts), PSI_EPSILON)
+    actual = np.maximum(_distribution(current_counts), PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks_statistic(reference_counts, current_counts) -> float:
+    """
+    Kolmogorov-Smirnov statistic between two binned distributions, the largest
+    gap between their cumulative distributions at the bin edges.
+    """
+    reference_cdf = np.cumsum(_distribution(reference_counts))
+    current_cdf = np.cumsum(_distribution(current_counts))
+    return float(np.max(np.abs(reference_cdf - current_cdf)))
+
+
+def build_reference_profile(data: pd.DataFrame, nominal_columns: List[str],
+                            target: str, n_bins: int) -> Dict[str, Any]:
+    """
+    Summarises the training data into the reference profile the drift monitor
+    compares production traffic against.
+
+    Parameters:
+    ----------
+    data : pd.DataFrame
+        Training data with raw features and the target.
+    nominal_columns : list
+        Columns summarised with count tables; other numeric columns get
+        histograms with `n_bins` quantile bins.
+    target : str
+        Target column. Its distribution is a placeholder for the prediction
+        reference until the trained model's predicted label distribution
+        replaces it (ReferenceProfileComponent.save_prediction_reference).
+    n_bins : int
+        Number of quantile bins per numeric feature.
+
+    Returns:
+    -------
+    dict:
+        JSON-serialisable profile with numeric, nominal and prediction sketches.
+    """
+    return build_reference_profile_from_chunks(lambda: [data], nominal_columns, target, n_bins)
+
+
+def sample_rows(chunks: Iterable[pd.DataFrame], columns: List[str], size: int,
+                seed: int = 0) -> pd.DataFrame:
+    """
+    Uniform random sample of at most `size` rows across all chunks, in one pass
+    and bounded memory: every row gets a random priority and the `size` rows
+    with the smallest priorities are kept.
+    """
+    rng = np.random.default_rng(seed)
+    sample, priorities = None, np.empty(0)
+    for chunk in chunks:
+        chunk_priorities = rng.random(len(chunk))
+        sample = chunk[columns] if sample is None else pd.concat([sample, chunk[columns]],
+                                                                 ignore_index=True)
+        priorities = np.concatenate([priorities, chunk_priorities])
+        if len(sample) > size:
+            keep = np.argpartition(priorities, size)[:size]
+            sample, priorities = sample.iloc[keep].reset_index(drop=True), priorities[keep]
+    return sample if sample is not None else pd.DataFrame(columns=columns)
+
+
+def build_reference_profile_from_chunks(chunk_factory: Callable[[], Iterable[pd.DataFrame]],
+                                        nominal_columns: List[str], target: str, n_bins: int,
+                                        edge_sample_size: int = EDGE_SAMPLE_SIZE) -> Dict[str, Any]:
+    """
+    Same as `build_reference_profile`, for data streamed in chunks, with memory
+    bounded by the chunk size. The chunks are read twice: the first pass draws a
+    uniform sample of `edge_sample_size` rows across all chunks for the
+    histogram bin edges, the second updates the sketches chunk by chunk.
+
+    Parameters:
+    ----------
+    chunk_factory : Callable
+        Returns a fresh iterator over the chunks, called once per pass.
+
+    Returns:
+    -------
+    dict:
+        JSON-serialisable profile with numeric, nominal and prediction sketches.
+    """
+    first_chunk = next(iter(chunk_factory()))
+    numeric_columns = first_chunk.drop(columns=[target, *nominal_columns]).select_dtypes("number").columns
+    numeric_columns = numeric_columns.to_list()
+    del first_chunk
+
+    sample = sample_rows(chunk_factory(), numeric_columns, edge_sample_size)
+    numeric: Dict[str, HistogramSketch] = {}
+    for column in numeric_columns:
+        values = sample[column].to_numpy(dtype=np.float64)
+        numeric[column] = HistogramSketch(
+            np.unique(np.nanquantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])))
+    del sample
+
+    category_counts: Dict[str, Dict[str, int]] = {column: {} for column in [*nominal_columns, target]}
+    for chunk in chunk_factory():
+        for column, sketch in numeric.items():
+            sketch.update(chunk[column].to_numpy(dtype=np.float64))
+        for column, counts in category_counts.items():
+            for key, count in category_keys(chunk[column]).value_counts().items():
+                counts[key] = counts.get(key, 0) + int(count)
+
+    return {"numeric": {column: sketch.to_dict() for column, sketch in numeric.items()},
+            "nominal": {column: CountSketch.from_counts(category_counts[column]).to_dict()
+                        for column in nominal_columns},
+            "prediction": CountSketch.from_counts(category_counts[target]).to_dict()}
+
+
+class DriftMonitor:
+    """
+    Collects sketches of the features and predictions seen by a prediction
+    worker and compares them with the training reference profile.
+
+    `observe` only appends the batch to a deque, so the request thread never
+    waits for the sketch updates. A background thread drains it every
+    `poll_interval` seconds, updates the sketches in one vectorised batch and
+    writes a snapshot to `snapshot_dir` every `flush_interval` seconds. The
+    deque is bounded by rows, not batches: a batch that would take the waiting
+    rows above `max_pending_rows` is dropped and counted, so memory per worker
+    stays bounded whatever the batch size.
+
+    Args:
+        reference_profile (Path): JSON profile written at training time.
+        snapshot_dir (Path): Folder for this worker's snapshots.
+        flush_interval (float): Seconds between snapshots.
+        max_pending_rows (int): Maximum number of rows waiting to be processed.
+    """
+    poll_interval = 0.05
+
+    def __init__(self, reference_profile: Path, snapshot_dir: Path,
+                 flush_interval: float = 60.0, max_pending_rows: int = 100_000) -> None:
+        with open(reference_profile) as file:
+            self.reference = json.load(file)
+        self.snapshot_path = Path(snapshot_dir) / f"snapshot_{socket.gethostname()}_{os.getpid()}.json"
+        self.flush_interval = flush_interval
+
+        self.numeric = {column: HistogramSketch(sketch["edges"])
+                        for column, sketch in self.reference["numeric"].items()}
+        self.nominal = {column: CountSketch(sketch["categories"])
+                        for column, sketch in self.reference["nominal"].items()}
+        self.prediction = CountSketch(self.reference["prediction"]["categories"])
+        self.observed_rows = 0
+        self.dropped_batches = 0
+        self.dropped_rows = 0
+
+        self.max_pending_rows = max_pending_rows
+        self._pending = deque()
+        self._pending_rows = 0
+        # guards only the pending row count, held for a single addition
+        self._pending_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+        self._worker.start()
+        atexit.register(self._flush_at_exit)
+
+
+    def observe(self, data: Optional[pd.DataFrame], predictions) -> None:
+        """
+        Queues a scored batch for the background thread. Never blocks. `data` is
+        None when only the predictions are known, e.g. users scored by id from the
+        feature store, whose raw features are not at hand.
+        """
+        rows = len(predictions)
+        with self._pending_lock:
+            accepted = self._pending_rows + rows <= self.max_pending_rows
+            if accepted:
+                self._pending_rows += rows
+            else:
+                self.dropped_batches += 1
+                self.dropped_rows += rows
+        if accepted:
+            self._pending.append((data, predictions))
+
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            time.sleep(self.poll_interval)
+            # drain what is waiting so it is processed as one batch
+            batches = [self._pending.popleft() for _ in range(len(self._pending))]
+            if batches:
+                rows = sum(len(predictions) for _, predictions in batches)
+                with self._pending_lock:
+                    self._pending_rows -= rows
+                try:
+                    self._update(batches)
+                except Exception:
+                    # a malformed batch must not stop the monitoring thread
+                    self.dropped_batches += len(batches)
+                    self.dropped_rows += rows
+            if time.monotonic() - last_flush >= self.flush_interval:
+                try:
+                    self.flush()
+                except Exception as e:
+                    # a failed snapshot write must not stop the monitoring thread either
+                    logging.warning(f"drift monitor snapshot failed: {e}")
+                last_flush = time.monotonic()
+
+    def _flush_at_exit(self) -> None:
+        # nothing can handle an error raised during interpreter shutdown
+        try:
+            self.flush()
+        except Exception as e:
+            logging.warning(f"drift monitor snapshot failed at exit: {e}")
+
+    def _update(self, batches) -> None:
+        frames = [batch for batch, _ in batches if batch is not None]
+        data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        predictions = np.concatenate([np.ravel(prediction) for _, prediction in batches])
+        with self._lock:
+            for column, sketch in self.numeric.items():
+                if column in data:
+                    sketch.update(data[column])
+            for column, sketch in self.nominal.items():
+                if column in data:
+                    sketch.update(data[column])
+            self.prediction.update(predictions)
+            self.observed_rows += len(predictions)
+
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        PSI (and KS for numeric features) of every sketch against the reference.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Drift statistics per feature, plus
+            "prediction" for the predicted label distribution.
+        """
+        with self._lock:
+            return drift_report(self.reference, self.numeric, self.nominal, self.prediction)
+
+
+    def flush(self) -> None:
+        """
+        Writes the current sketches and drift statistics to this worker's snapshot file.
+        """
+        try:
+            with self._lock:
+                snapshot = {
+                    "timestamp": time.time(),
+                    "observed_rows": self.observed_rows,
+                    "dropped_batches": self.dropped_batches,
+                    "dropped_rows": self.dropped_rows,
+                    "numeric": {column: sketch.to_dict() for column, sketch in self.numeric.items()},
+                    "nominal": {column: sketch.to_dict() for column, sketch in self.nominal.items()},
+                    "prediction": self.prediction.to_dict(),
+                    "drift": drift_report(self.reference, self.numeric, self.nominal, self.prediction),
+                }
+            os.makedirs(self.snapshot_path.parent, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as file:
+                json.dump(snapshot, file)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            raise CustomException(e,sys)
+
+
+def drift_report(reference: Dict[str, Any], numeric: Dict[str, HistogramSketch],
+                 nominal: Dict[str, CountSketch], prediction: CountSketch) -> Dict[str, Dict[str, float]]:
+    """
+    Compares sketches with the reference profile, see `DriftMonitor.report`.
+    """
+    report = {}
+    for column, sketch in numeric.items():
+        reference_counts = reference["numeric"][column]["counts"]
+        report[column] = {"psi": population_stability_index(reference_counts, sketch.counts),
+                          "ks": ks_statistic(reference_counts, sketch.counts)}
+    for column, sketch in nominal.items():
+        reference_counts = reference["nominal"][column]["counts"]
+        report[column] = {"psi": population_stability_index(
+            [reference_counts.get(key, 0) for key in sketch.counts],
+            list(sketch.counts.values()))}
+    reference_counts = reference["prediction"]["counts"]
+    report["prediction"] = {"psi": population_stability_index(
+        [reference_counts.get(key, 0) for key in prediction.counts],
+        list(prediction.counts.values()))}
+    return report
+
+
+def merge_snapshots(snapshot_dir: Path, reference_profile: Path) -> Dict[str, Any]:
+    """
+    Merges the snapshots of all workers in `snapshot_dir` and recomputes the
+    drift statistics over the combined traffic.
+
+    Returns:
+        Dict[str, Any]: Total observed rows and drift statistics per feature.
+    """
+    try:
+        with open(reference_profile) as file:
+            reference = json.load(file)
+        numeric = {column: HistogramSketch(sketch["edges"]) for column, sketch in reference["numeric"].items()}
+        nominal = {column: CountSketch(sketch["categories"]) for column, sketch in reference["nominal"].items()}
+        prediction = CountSketch(reference["prediction"]["categories"])
+        observed_rows = 0
+
+        for path in glob.glob(os.path.join(snapshot_dir, "snapshot_*.json")):
+            with open(path) as file:
+                snapshot = json.load(file)
+            observed_rows += snapshot["observed_rows"]
+            for column, sketch in numeric.items():
+                sketch.merge(HistogramSketch.from_dict(snapshot["numeric"][column]))
+            for column, sketch in nominal.items():
+                sketch.merge(CountSketch.from_dict(snapshot["nominal"][column]))
+            prediction.merge(CountSketch.from_dict(snapshot["prediction"]))
+
+        return {"observed_rows": observed_rows,
+                "drift": drift_report(reference, numeric, nominal, prediction)}
+    except Exception as e:
+        raise CustomException(e,sys)
+
+
+# one monitor per worker process, shared by every PredictionPipeline
+_monitors: Dict[str, DriftMonitor] = {}
+_monitors_lock = threading.Lock()
+
+
+def get_monitor(config: Dict[str, Any]) -> Optional[DriftMonitor]:
+    """
+    Returns this process's DriftMonitor for the `monitoring` section of the
+    prediction config, or None when monitoring is disabled or no reference
+    profile has been saved yet.
+    """
+    if not config or not config.get("enabled", False):
+        return None
+    profile = config.reference_profile
+    monitor = _monitors.get(profile)
+    if monitor is None:
+        with _monitors_lock:
+            monitor = _monitors.get(profile)
+            if monitor is None:
+                if not os.path.exists(profile):
+                    return None
+                monitor = DriftMonitor(reference_profile=profile,
+                                       snapshot_dir=config.snapshot_dir,
+                                       flush_interval=config.flush_interval_seconds,
+                                       max_pending_rows=config.max_pending_rows)
+                _monitors[profile] = monitor
+    return monitor